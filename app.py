@@ -6,17 +6,34 @@ Minimalist ZK proof generation service for Noir circuits.
 
 import os
 import json
+import fcntl
+import asyncio
 import logging
 import subprocess
 import tempfile
 import base64
 import hashlib
+import time
+import uuid
+import shutil
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Deque, Set, Tuple, Union, Callable, Awaitable, Iterator, cast
 
-from fastapi import FastAPI, HTTPException
+import orjson
+import requests
+import toml
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import Web3
+from web3.providers.rpc.utils import REQUEST_RETRY_ALLOWLIST, ExceptionRetryConfiguration
+from web3.types import TxParams
 
 # =============================================================================
 # CONFIGURATION
@@ -29,11 +46,24 @@ class Config:
     """Service configuration."""
     CIRCUITS_DIR = "circuits"
     PROOFS_DIR = "proofs"
+    CACHE_DIR = os.path.join(CIRCUITS_DIR, "_cache")
+    SCRATCH_DIR = os.path.join(CIRCUITS_DIR, "_scratch")
     NARGO_PATH = "nargo"
     BB_PATH = "bb"
+    OUTPUT_TAIL_BYTES = 64 * 1024
+    PROVE_WORKERS = int(os.getenv("ARCANA_PROVE_WORKERS", os.cpu_count() or 1))
+    MAX_BATCH_SIZE = int(os.getenv("ARCANA_MAX_BATCH_SIZE", "16"))
+    PROOF_JOB_TIMEOUT = float(os.getenv("ARCANA_PROOF_JOB_TIMEOUT", "600"))
+    PROOF_JOB_MAX_ATTEMPTS = int(os.getenv("ARCANA_PROOF_JOB_MAX_ATTEMPTS", "3"))
+    PROOF_JOB_BACKOFF = float(os.getenv("ARCANA_PROOF_JOB_BACKOFF", "2"))
+    METADATA_FLUSH_INTERVAL = float(os.getenv("ARCANA_METADATA_FLUSH_INTERVAL", "5"))
+    METADATA_FLUSH_OPS = int(os.getenv("ARCANA_METADATA_FLUSH_OPS", "100"))
+    RPC_POOL_SIZE = int(os.getenv("ARCANA_RPC_POOL_SIZE", "32"))
+    GAS_PRICE_TTL = float(os.getenv("ARCANA_GAS_PRICE_TTL", "5"))
+    NETWORK_PROBE_INTERVAL = float(os.getenv("ARCANA_NETWORK_PROBE_INTERVAL", "30"))
 
 # Initialize directories
-for directory in [Config.CIRCUITS_DIR, Config.PROOFS_DIR]:
+for directory in [Config.CIRCUITS_DIR, Config.PROOFS_DIR, Config.CACHE_DIR, Config.SCRATCH_DIR]:
     os.makedirs(directory, exist_ok=True)
 
 # =============================================================================
@@ -57,6 +87,15 @@ class ProofRequest(BaseModel):
     network: str = Field(default="sapphire_testnet", description="Target network")
     user_address: str = Field(..., description="User's address")
 
+class ProofJob(BaseModel):
+    """Single proof in a batch request."""
+    circuit_id: str = Field(..., description="Circuit ID")
+    inputs: Dict[str, Any] = Field(..., description="Private inputs")
+
+class BatchProofRequest(BaseModel):
+    """Batch proof generation request."""
+    jobs: List[ProofJob] = Field(..., description="Proofs to generate")
+
 class TransactionRequest(BaseModel):
     """Transaction broadcast request."""
     circuit_id: str = Field(..., description="Circuit ID")
@@ -76,6 +115,87 @@ class CircuitInfo(BaseModel):
     proof_count: int
     network: str
 
+# =============================================================================
+# SUBPROCESS HELPERS
+# =============================================================================
+
+async def _drain_output(stream: asyncio.StreamReader, name: str) -> bytes:
+    """Log a child process stream as it arrives, keeping only its tail."""
+    tail: Deque[bytes] = deque()
+    tail_size = 0
+    partial = b""
+    # Checked once: bb can print megabytes, and splitting and decoding is wasted when debug is off
+    log_lines = logger.isEnabledFor(logging.DEBUG)
+    
+    while chunk := await stream.read(65536):
+        tail.append(chunk)
+        tail_size += len(chunk)
+        while tail_size - len(tail[0]) >= Config.OUTPUT_TAIL_BYTES:
+            tail_size -= len(tail.popleft())
+        
+        if not log_lines:
+            continue
+        
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        if len(partial) > Config.OUTPUT_TAIL_BYTES:
+            lines.append(partial)
+            partial = b""
+        for line in lines:
+            logger.debug("[%s] %s", name, line.decode(errors='replace').rstrip())
+    
+    if partial:
+        logger.debug("[%s] %s", name, partial.decode(errors='replace').rstrip())
+    
+    return b"".join(tail)[-Config.OUTPUT_TAIL_BYTES:]
+
+async def run_command(cmd: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+    """Run an external command without blocking the event loop.
+    
+    Output is streamed to the debug log; only the last OUTPUT_TAIL_BYTES of
+    stdout and stderr are kept for the result and error messages.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd) if cwd is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    name = Path(cmd[0]).name
+    
+    try:
+        stdout, stderr, _ = await asyncio.gather(
+            _drain_output(proc.stdout, name),
+            _drain_output(proc.stderr, name),
+            proc.wait()
+        )
+    except asyncio.CancelledError:
+        # Don't leave nargo/bb running when the caller gives up
+        proc.kill()
+        await proc.wait()
+        raise
+    
+    stdout_text = stdout.decode(errors="replace")
+    stderr_text = stderr.decode(errors="replace")
+    
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout_text, stderr=stderr_text)
+    
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout_text, stderr_text)
+
+# =============================================================================
+# FILE HELPERS
+# =============================================================================
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Hardlink a file, copying it when linking isn't possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # EXDEV across filesystems, or no hardlink support
+        shutil.copy2(src, dst)
+    return dst
+
 # =============================================================================
 # CORE SERVICES
 # =============================================================================
@@ -86,17 +206,28 @@ class CircuitManager:
     def __init__(self):
         self.circuits_dir = Path(Config.CIRCUITS_DIR)
         self.circuits_dir.mkdir(exist_ok=True)
+        # circuit_id -> (metadata.json st_mtime_ns, parsed info)
+        self._meta_cache: Dict[str, Tuple[int, CircuitInfo]] = {}
+        # Proof counts not yet flushed to metadata.json
+        self._pending_proofs: Dict[str, int] = {}
+        self._pending_ops = 0
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
     
-    def register_circuit(self, request: CircuitRequest) -> Dict[str, Any]:
+    async def register_circuit(self, request: CircuitRequest) -> Dict[str, Any]:
         """Register a new circuit."""
         logger.info(f"Registering circuit: {request.circuit_id}")
         
+        if request.circuit_id.startswith("_"):
+            raise HTTPException(status_code=400, detail="Circuit IDs starting with '_' are reserved")
+        
         circuit_path = self.circuits_dir / request.circuit_id
         
         try:
             # Clean existing circuit
+            self._meta_cache.pop(request.circuit_id, None)
+            self._pending_proofs.pop(request.circuit_id, None)
             if circuit_path.exists():
-                import shutil
                 shutil.rmtree(circuit_path)
             
             # Create circuit structure
@@ -108,24 +239,23 @@ class CircuitManager:
             (src_path / "main.nr").write_text(request.main_nr)
             
             # Create default Prover.toml
-            import toml
             prover_toml = {"x": 1, "y": 2}
             (circuit_path / "Prover.toml").write_text(toml.dumps(prover_toml))
             
             # Validate circuit
-            self._validate_circuit(circuit_path)
+            await self._validate_circuit(circuit_path)
             
             # Save metadata
             metadata = {
                 "description": request.description,
-                "created_at": datetime.now().isoformat(),
+                "created_at": datetime.now(),
                 "status": "registered",
                 "verifier_address": None,
                 "proof_count": 0,
                 "network": request.network
             }
             
-            (circuit_path / "metadata.json").write_text(json.dumps(metadata, indent=2))
+            self._write_metadata(request.circuit_id, metadata)
             
             logger.info(f"Circuit {request.circuit_id} registered successfully")
             return {"status": "success", "circuit_id": request.circuit_id}
@@ -133,56 +263,188 @@ class CircuitManager:
         except Exception as e:
             logger.error(f"Circuit registration failed: {str(e)}")
             if circuit_path.exists():
-                import shutil
                 shutil.rmtree(circuit_path)
             raise HTTPException(status_code=400, detail=str(e))
     
-    def _validate_circuit(self, circuit_path: Path) -> None:
+    async def _validate_circuit(self, circuit_path: Path) -> None:
         """Validate circuit using nargo check."""
         try:
-            subprocess.run(
-                [Config.NARGO_PATH, "check"],
-                cwd=circuit_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            await run_command([Config.NARGO_PATH, "check"], cwd=circuit_path)
             logger.info("Circuit validation successful")
         except subprocess.CalledProcessError as e:
             raise Exception(f"Circuit validation failed: {e.stderr}")
     
+    def _write_metadata(self, circuit_id: str, metadata: Dict[str, Any]) -> None:
+        """Atomically write circuit metadata and drop its cached copy."""
+        metadata_path = self.circuits_dir / circuit_id / "metadata.json"
+        tmp_path = metadata_path.with_name(f".metadata.{os.getpid()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, metadata_path)
+        self._meta_cache.pop(circuit_id, None)
+    
+    @contextmanager
+    def _metadata_lock(self, circuit_id: str) -> Iterator[None]:
+        """Hold an exclusive lock on a circuit's metadata across worker processes."""
+        lock_path = self.circuits_dir / circuit_id / ".metadata.lock"
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def update_metadata(self, circuit_id: str, **changes: Any) -> None:
+        """Update fields of the stored circuit metadata."""
+        metadata_path = self.circuits_dir / circuit_id / "metadata.json"
+        if metadata_path.exists():
+            with self._metadata_lock(circuit_id):
+                metadata = orjson.loads(metadata_path.read_bytes())
+                metadata.update(changes)
+                metadata["last_modified"] = datetime.now()
+                self._write_metadata(circuit_id, metadata)
+    
+    def _add_proof_count(self, circuit_id: str, count: int) -> None:
+        """Add flushed proofs to the stored counter under the metadata lock."""
+        metadata_path = self.circuits_dir / circuit_id / "metadata.json"
+        with self._metadata_lock(circuit_id):
+            metadata = orjson.loads(metadata_path.read_bytes())
+            metadata["proof_count"] += count
+            metadata["last_modified"] = datetime.now()
+            self._write_metadata(circuit_id, metadata)
+    
+    def record_proof(self, circuit_id: str) -> None:
+        """Increment the proof counter of a circuit.
+        
+        Increments are kept in memory and written by flush_metadata, so a
+        burst of proofs costs one metadata write instead of one per proof.
+        With several server workers, each reports its own pending proofs on
+        top of the stored count until they are flushed.
+        """
+        self._pending_proofs[circuit_id] = self._pending_proofs.get(circuit_id, 0) + 1
+        self._pending_ops += 1
+        if self._pending_ops >= Config.METADATA_FLUSH_OPS:
+            self._flush_requested.set()
+    
+    async def flush_metadata(self) -> None:
+        """Write pending proof counts to metadata.json."""
+        async with self._flush_lock:
+            pending, self._pending_proofs = self._pending_proofs, {}
+            self._pending_ops = 0
+            self._flush_requested.clear()
+            
+            for circuit_id, count in pending.items():
+                try:
+                    # Other workers flush into the same file, so merge under a lock
+                    await asyncio.to_thread(self._add_proof_count, circuit_id, count)
+                except FileNotFoundError:
+                    # Circuit was removed since the proofs were recorded
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to flush metadata for circuit {circuit_id}: {e}")
+    
+    async def run_metadata_flusher(self) -> None:
+        """Flush pending metadata periodically or once enough updates pile up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=Config.METADATA_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush_metadata()
+    
     def get_circuit_info(self, circuit_id: str) -> CircuitInfo:
         """Get circuit information."""
         circuit_path = self.circuits_dir / circuit_id
+        metadata_path = circuit_path / "metadata.json"
         
-        if not circuit_path.exists():
-            raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
+        try:
+            mtime_ns = metadata_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            if not circuit_path.exists():
+                raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
+            return self._default_info(circuit_id)
         
-        metadata_path = circuit_path / "metadata.json"
-        if metadata_path.exists():
-            metadata = json.loads(metadata_path.read_text())
+        # Reuse the parsed metadata until the file changes on disk
+        cached = self._meta_cache.get(circuit_id)
+        if cached is not None and cached[0] == mtime_ns:
+            info = cached[1]
         else:
-            metadata = {
-                "description": None,
-                "created_at": datetime.now().isoformat(),
-                "status": "registered",
-                "verifier_address": None,
-                "proof_count": 0,
-                "network": "sapphire_testnet"
-            }
-        
-        return CircuitInfo(circuit_id=circuit_id, **metadata)
+            info = self._load_info(circuit_id)
+            self._meta_cache[circuit_id] = (mtime_ns, info)
+        return self._with_pending(info)
+    
+    def _default_info(self, circuit_id: str) -> CircuitInfo:
+        """Info for a circuit directory without metadata.json."""
+        return CircuitInfo(
+            circuit_id=circuit_id,
+            description=None,
+            created_at=datetime.now(),
+            status="registered",
+            verifier_address=None,
+            proof_count=0,
+            network="sapphire_testnet"
+        )
     
-    def list_circuits(self) -> List[CircuitInfo]:
+    def _load_info(self, circuit_id: str) -> CircuitInfo:
+        """Parse a circuit's metadata.json."""
+        metadata_path = self.circuits_dir / circuit_id / "metadata.json"
+        return CircuitInfo(circuit_id=circuit_id, **orjson.loads(metadata_path.read_bytes()))
+    
+    def _with_pending(self, info: CircuitInfo) -> CircuitInfo:
+        """Add proofs recorded but not yet flushed to the stored count."""
+        pending = self._pending_proofs.get(info.circuit_id)
+        if pending:
+            return info.model_copy(update={"proof_count": info.proof_count + pending})
+        return info
+    
+    async def list_circuits(self) -> List[CircuitInfo]:
         """List all registered circuits."""
-        circuits = []
-        for circuit_dir in self.circuits_dir.iterdir():
-            if circuit_dir.is_dir():
+        def scan() -> List[Tuple[str, Optional[int]]]:
+            found = []
+            with os.scandir(self.circuits_dir) as entries:
+                for entry in entries:
+                    # Skip internal directories such as the artifact cache
+                    if not entry.is_dir() or entry.name.startswith("_"):
+                        continue
+                    try:
+                        mtime_ns = os.stat(os.path.join(entry.path, "metadata.json")).st_mtime_ns
+                    except FileNotFoundError:
+                        mtime_ns = None
+                    found.append((entry.name, mtime_ns))
+            return found
+        
+        def load(names: List[str]) -> List[Union[CircuitInfo, Exception]]:
+            results: List[Union[CircuitInfo, Exception]] = []
+            for name in names:
                 try:
-                    circuits.append(self.get_circuit_info(circuit_dir.name))
+                    results.append(self._load_info(name))
                 except Exception as e:
-                    logger.warning(f"Failed to get info for circuit {circuit_dir.name}: {e}")
-        return circuits
+                    results.append(e)
+            return results
+        
+        found = await asyncio.to_thread(scan)
+        
+        # Cache hits are served here; only changed metadata is parsed off the loop
+        infos: Dict[str, CircuitInfo] = {}
+        misses: List[Tuple[str, int]] = []
+        for name, mtime_ns in found:
+            cached = self._meta_cache.get(name)
+            if mtime_ns is None:
+                infos[name] = self._default_info(name)
+            elif cached is not None and cached[0] == mtime_ns:
+                infos[name] = cached[1]
+            else:
+                misses.append((name, mtime_ns))
+        
+        if misses:
+            loaded = await asyncio.to_thread(load, [name for name, _ in misses])
+            for (name, mtime_ns), result in zip(misses, loaded):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to get info for circuit {name}: {result}")
+                else:
+                    self._meta_cache[name] = (mtime_ns, result)
+                    infos[name] = result
+        
+        return [self._with_pending(infos[name]) for name, _ in found if name in infos]
 
 class ProofGenerator:
     """Handles ZK proof generation."""
@@ -190,46 +452,61 @@ class ProofGenerator:
     def __init__(self):
         self.proofs_dir = Path(Config.PROOFS_DIR)
         self.proofs_dir.mkdir(exist_ok=True)
+        # Bounds concurrent nargo/bb pipelines to the available cores
+        self._prove_slots = asyncio.Semaphore(Config.PROVE_WORKERS)
+    
+    async def generate_proofs_batch(self, jobs: List[Tuple[str, Dict[str, Any]]]) -> List[Union[bytes, Exception]]:
+        """Generate several proofs concurrently, one result or error per job."""
+        if len(jobs) > Config.MAX_BATCH_SIZE:
+            raise Exception(f"Batch too large: {len(jobs)} jobs (max {Config.MAX_BATCH_SIZE})")
+        
+        return await asyncio.gather(
+            *(self.generate_proof(circuit_id, inputs) for circuit_id, inputs in jobs),
+            return_exceptions=True
+        )
     
-    def generate_proof(self, circuit_id: str, inputs: Dict[str, Any]) -> str:
+    async def generate_proof(self, circuit_id: str, inputs: Dict[str, Any]) -> bytes:
         """Generate a ZK proof for the given circuit and inputs."""
+        async with self._prove_slots:
+            return await self._generate_proof(circuit_id, inputs)
+    
+    async def _generate_proof(self, circuit_id: str, inputs: Dict[str, Any]) -> bytes:
+        """Run the nargo/bb proving pipeline in a scratch directory."""
         logger.info(f"Generating proof for circuit: {circuit_id}")
         
         circuit_path = Path(Config.CIRCUITS_DIR) / circuit_id
         if not circuit_path.exists():
             raise Exception(f"Circuit {circuit_id} not found")
         
-        with tempfile.TemporaryDirectory() as tmpdir:
+        # Scratch space lives next to the circuits so sources can be hardlinked
+        with tempfile.TemporaryDirectory(dir=Config.SCRATCH_DIR) as tmpdir:
+            # SCRATCH_DIR is relative, and bb runs inside the scratch copy, so every
+            # path handed to it must be absolute
+            temp_circuit_path = Path(tmpdir).resolve()
             try:
-                # Copy circuit to temp directory
-                import shutil
-                shutil.copytree(circuit_path, tmpdir, dirs_exist_ok=True)
-                temp_circuit_path = Path(tmpdir)
+                # Link the read-only sources; build outputs and Prover.toml are fresh per proof
+                shutil.copytree(
+                    circuit_path,
+                    temp_circuit_path,
+                    dirs_exist_ok=True,
+                    copy_function=link_or_copy,
+                    ignore=shutil.ignore_patterns("target", "Prover.toml", "metadata.json")
+                )
+                
+                # Seed the program compiled at registration; nargo skips recompiling
+                # when its hash matches. Copied, not linked, since nargo rewrites it.
+                compiled_path = circuit_path / "target" / "noir.json"
+                if compiled_path.exists():
+                    (temp_circuit_path / "target").mkdir()
+                    shutil.copy2(compiled_path, temp_circuit_path / "target" / "noir.json")
                 
                 # Write Prover.toml from inputs
-                import toml
                 prover_toml_path = temp_circuit_path / "Prover.toml"
                 prover_toml_path.write_text(toml.dumps(inputs))
                 
-                # Compile circuit
-                logger.info("Compiling circuit...")
-                subprocess.run(
-                    [Config.NARGO_PATH, "compile"],
-                    cwd=temp_circuit_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                # Execute circuit
+                # Execute circuit (compiles first if the program is stale)
                 logger.info("Executing circuit...")
-                subprocess.run(
-                    [Config.NARGO_PATH, "execute"],
-                    cwd=temp_circuit_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
+                await run_command([Config.NARGO_PATH, "execute"], cwd=temp_circuit_path)
                 
                 # Check files exist
                 witness_path = temp_circuit_path / "target" / "noir.gz"
@@ -245,7 +522,7 @@ class ProofGenerator:
                 proof_output_dir = temp_circuit_path / "proof_output"
                 proof_output_dir.mkdir(exist_ok=True)
                 
-                subprocess.run(
+                await run_command(
                     [
                         Config.BB_PATH,
                         "prove",
@@ -253,10 +530,7 @@ class ProofGenerator:
                         "-w", str(witness_path),
                         "-o", str(proof_output_dir),
                     ],
-                    cwd=temp_circuit_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
+                    cwd=temp_circuit_path
                 )
                 
                 # Read proof
@@ -276,10 +550,9 @@ class ProofGenerator:
                 if len(proof_bytes) == 0:
                     raise Exception("Generated proof is empty")
                 
-                proof_b64 = base64.b64encode(proof_bytes).decode('utf-8')
                 logger.info(f"Proof generated successfully, size: {len(proof_bytes)} bytes")
                 
-                return proof_b64
+                return proof_bytes
                 
             except subprocess.CalledProcessError as e:
                 raise Exception(f"Proof generation failed: {e.stderr}")
@@ -296,64 +569,118 @@ class BlockchainManager:
             "ethereum_mainnet": "https://mainnet.infura.io/v3/YOUR_PROJECT_ID",
             "ethereum_sepolia": "https://sepolia.etherscan.io"
         }
+        
+        # One keep-alive connection pool shared by all RPC clients. Every JSON-RPC
+        # call is a POST, including eth_sendRawTransaction, so the transport only
+        # retries failed connects; reads and timeouts are retried by web3 below.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=len(self.rpc_urls),
+            pool_maxsize=Config.RPC_POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=0.2,
+                allowed_methods=frozenset(["POST"])
+            )
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # web3's default allowlist also retries eth_sendRawTransaction after a timeout
+        # or HTTP error, when the node may already have the transaction; leave it out
+        self._retry_configuration = ExceptionRetryConfiguration(
+            errors=(
+                requests.exceptions.ConnectionError,
+                requests.exceptions.HTTPError,
+                requests.exceptions.Timeout
+            ),
+            method_allowlist=[m for m in REQUEST_RETRY_ALLOWLIST if m != "eth_sendRawTransaction"]
+        )
+        # web3 binds a provider's session to the thread that created it and opens a
+        # fresh default session on any other thread, so clients are kept per thread
+        self._local = threading.local()
+        # network -> (monotonic fetch time, gas price)
+        self._gas_prices: Dict[str, Tuple[float, int]] = {}
+        # Last background liveness result per network, reported by /status
+        self.network_status: Dict[str, bool] = {}
     
-    def create_unsigned_transaction(self, to_address: str, data: bytes, user_address: str, network: str) -> Dict[str, Any]:
-        """Create unsigned transaction for offline signing."""
-        try:
-            from web3 import Web3
-            
+    def _get_client(self, network: str) -> Web3:
+        """Get this thread's Web3 client for a network, creating it on first use."""
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        
+        client = clients.get(network)
+        if client is None:
             rpc_url = self.rpc_urls.get(network)
             if not rpc_url:
                 raise Exception(f"Unsupported network: {network}")
             
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            if not w3.is_connected():
-                raise Exception(f"Failed to connect to {network}")
-            
-            nonce = w3.eth.get_transaction_count(Web3.to_checksum_address(user_address))
-            gas_price = w3.eth.gas_price
-            
-            transaction = {
-                'nonce': nonce,
-                'gas': 500000,
-                'gasPrice': gas_price,
-                'to': Web3.to_checksum_address(to_address),
-                'data': data.hex(),
-                'from': Web3.to_checksum_address(user_address),
-                'value': 0
-            }
-            
-            # Estimate gas
-            from typing import cast
-            from web3.types import TxParams
-            estimated_gas = w3.eth.estimate_gas(cast(TxParams, transaction))
-            transaction['gas'] = estimated_gas
-            
-            return {
-                "status": "success",
-                "unsigned_transaction": transaction,
-                "network": network,
-                "user_address": user_address,
-                "to_address": to_address
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to create transaction: {str(e)}")
-            return {"status": "error", "error": str(e)}
+            client = Web3(Web3.HTTPProvider(
+                rpc_url,
+                session=self._session,
+                exception_retry_configuration=self._retry_configuration
+            ))
+            clients[network] = client
+        return client
+    
+    def probe_networks(self) -> None:
+        """Check connectivity of every configured network."""
+        for network in self.rpc_urls:
+            try:
+                self.network_status[network] = self._get_client(network).is_connected()
+            except Exception:
+                self.network_status[network] = False
+    
+    async def run_network_probe(self) -> None:
+        """Refresh network_status in the background."""
+        while True:
+            await asyncio.to_thread(self.probe_networks)
+            await asyncio.sleep(Config.NETWORK_PROBE_INTERVAL)
+    
+    def _get_nonce_and_gas_price(self, w3: Web3, network: str, address: str) -> Tuple[int, int]:
+        """Fetch the account nonce and gas price in a single RPC round-trip."""
+        cached = self._gas_prices.get(network)
+        if cached is not None and time.monotonic() - cached[0] < Config.GAS_PRICE_TTL:
+            return w3.eth.get_transaction_count(address), cached[1]
+        
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_transaction_count(address))
+            batch.add(w3.eth.gas_price)
+            nonce, gas_price = batch.execute()
+        
+        self._gas_prices[network] = (time.monotonic(), gas_price)
+        return nonce, gas_price
+    
+    def build_unsigned_transaction(self, to_address: str, data: bytes, user_address: str, network: str) -> Dict[str, Any]:
+        """Build an unsigned transaction, raising the underlying RPC error on failure."""
+        w3 = self._get_client(network)
+        nonce, gas_price = self._get_nonce_and_gas_price(
+            w3, network, Web3.to_checksum_address(user_address)
+        )
+        
+        transaction = {
+            'nonce': nonce,
+            'gas': 500000,
+            'gasPrice': gas_price,
+            'to': Web3.to_checksum_address(to_address),
+            'data': data.hex(),
+            'from': Web3.to_checksum_address(user_address),
+            'value': 0
+        }
+        
+        # Estimate gas
+        estimated_gas = w3.eth.estimate_gas(cast(TxParams, transaction))
+        transaction['gas'] = estimated_gas
+        return transaction
     
     def broadcast_signed_transaction(self, signed_transaction_hex: str, network: str) -> Dict[str, Any]:
         """Broadcast a signed transaction."""
         try:
-            from web3 import Web3
-            
-            rpc_url = self.rpc_urls.get(network)
-            if not rpc_url:
-                raise Exception(f"Unsupported network: {network}")
-            
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            if not w3.is_connected():
-                raise Exception(f"Failed to connect to network")
-            
+            w3 = self._get_client(network)
             # Decode signed transaction
             if signed_transaction_hex.startswith('0x'):
                 signed_transaction_hex = signed_transaction_hex[2:]
@@ -388,18 +715,10 @@ class BlockchainManager:
     def create_unsigned_deployment_transaction(self, bytecode: str, network: str, user_address: str) -> Dict[str, Any]:
         """Create unsigned deployment transaction."""
         try:
-            from web3 import Web3
-            
-            rpc_url = self.rpc_urls.get(network)
-            if not rpc_url:
-                raise Exception(f"Unsupported network: {network}")
-            
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            if not w3.is_connected():
-                raise Exception(f"Failed to connect to {network}")
-            
-            nonce = w3.eth.get_transaction_count(Web3.to_checksum_address(user_address))
-            gas_price = w3.eth.gas_price
+            w3 = self._get_client(network)
+            nonce, gas_price = self._get_nonce_and_gas_price(
+                w3, network, Web3.to_checksum_address(user_address)
+            )
             
             transaction = {
                 'nonce': nonce,
@@ -411,8 +730,6 @@ class BlockchainManager:
             }
             
             # Estimate gas
-            from typing import cast
-            from web3.types import TxParams
             estimated_gas = w3.eth.estimate_gas(cast(TxParams, transaction))
             transaction['gas'] = estimated_gas
             
@@ -430,10 +747,111 @@ class BlockchainManager:
 class ContractManager:
     """Manages contract compilation."""
     
+    # Artifacts kept per cache entry, relative to the circuit target directory
+    CACHED_ARTIFACTS = ["noir.json", "vk/vk", "verifier.sol", "verifier.bin"]
+    
     def __init__(self):
         self.blockchain_manager = BlockchainManager()
-
-    def compile_circuit(self, circuit_id: str) -> dict:
+        self.cache_dir = Path(Config.CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._toolchain_version: Optional[str] = None
+    
+    async def _get_toolchain_version(self) -> str:
+        """Get nargo, bb and solc versions, which all affect compiled artifacts."""
+        if self._toolchain_version is None:
+            versions = await asyncio.gather(
+                run_command([Config.NARGO_PATH, "--version"]),
+                run_command([Config.BB_PATH, "--version"]),
+                run_command(["solc", "--version"])
+            )
+            self._toolchain_version = "\n".join(v.stdout.strip() for v in versions)
+        return self._toolchain_version
+    
+    async def _cache_path(self, circuit_path: Path) -> Path:
+        """Get the cache entry path for the current circuit sources."""
+        digest = hashlib.sha256()
+        for part in [
+            (circuit_path / "Nargo.toml").read_bytes(),
+            (circuit_path / "src" / "main.nr").read_bytes(),
+            (await self._get_toolchain_version()).encode(),
+            b"--optimize --optimize-runs 200"
+        ]:
+            # Length-prefix each part so boundaries can't shift between inputs
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return self.cache_dir / digest.hexdigest()
+    
+    def _store_artifacts(self, cache_path: Path, target_dir: Path) -> None:
+        """Store compiled artifacts, publishing the entry with an atomic rename."""
+        tmp_path = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-"))
+        try:
+            for artifact in self.CACHED_ARTIFACTS:
+                (tmp_path / artifact).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(target_dir / artifact, tmp_path / artifact)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # Another request may have stored the same entry first
+            logger.warning(f"Failed to cache artifacts: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    
+    def _restore_artifacts(self, cache_path: Path, target_dir: Path) -> None:
+        """Copy cached artifacts into a circuit target directory."""
+        for artifact in self.CACHED_ARTIFACTS:
+            (target_dir / artifact).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(cache_path / artifact, target_dir / artifact)
+    
+    async def _compile_verifier(self, verifier_path: Path) -> str:
+        """Compile a Solidity verifier and persist its bytecode as verifier.bin."""
+        verifier_source = verifier_path.read_text()
+        
+        with tempfile.TemporaryDirectory() as compile_dir:
+            temp_verifier_path = Path(compile_dir) / "Verifier.sol"
+            temp_verifier_path.write_text(verifier_source)
+            
+            await run_command([
+                "solc",
+                "--bin",
+                "--optimize",
+                "--optimize-runs", "200",
+                str(temp_verifier_path),
+                "-o", compile_dir
+            ], cwd=Path(compile_dir))
+            
+            bin_files = list(Path(compile_dir).glob("*.bin"))
+            if not bin_files:
+                raise Exception("No compiled bytecode found")
+            
+            bytecode = bin_files[0].read_text().strip()
+            if bytecode.startswith('0x'):
+                bytecode = bytecode[2:]
+        
+        # Persist bytecode so /deploy doesn't need to run solc again
+        bytecode_path = verifier_path.with_name("verifier.bin")
+        tmp_path = bytecode_path.with_name(f"verifier.bin.{os.getpid()}.tmp")
+        tmp_path.write_text(bytecode)
+        os.replace(tmp_path, bytecode_path)
+        return bytecode
+    
+    async def get_verifier_bytecode(self, circuit_id: str) -> str:
+        """Get deployable verifier bytecode, compiling it once for older circuits."""
+        target_dir = Path(Config.CIRCUITS_DIR) / circuit_id / "target"
+        try:
+            return (target_dir / "verifier.bin").read_text()
+        except FileNotFoundError:
+            pass
+        
+        # Circuits registered before verifier.bin was persisted only have the source
+        verifier_path = target_dir / "verifier.sol"
+        if not verifier_path.exists():
+            raise Exception(f"Circuit {circuit_id} not compiled. Register it first.")
+        
+        logger.info(f"Compiling missing verifier bytecode for circuit: {circuit_id}")
+        try:
+            return await self._compile_verifier(verifier_path)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Compilation failed: {e.stderr}")
+    
+    async def compile_circuit(self, circuit_id: str) -> dict:
         """Compile circuit and generate verifier."""
         circuit_path = Path(Config.CIRCUITS_DIR) / circuit_id
         target_dir = circuit_path / "target"
@@ -443,68 +861,232 @@ class ContractManager:
         logger.info(f"Compiling circuit: {circuit_id}")
         
         try:
+            # Reuse artifacts compiled earlier from identical sources
+            cache_path = await self._cache_path(circuit_path)
+            try:
+                bytecode = (cache_path / "verifier.bin").read_text()
+                self._restore_artifacts(cache_path, target_dir)
+            except FileNotFoundError:
+                # No entry yet, or it was pruned from disk; compile from scratch
+                pass
+            else:
+                logger.info(f"Using cached artifacts for circuit: {circuit_id}")
+                return {
+                    "status": "success",
+                    "verifier_path": str(verifier_path),
+                    "bytecode": bytecode,
+                    "circuit_id": circuit_id
+                }
+            
             # Compile circuit
-            subprocess.run(
-                [Config.NARGO_PATH, "compile"],
-                cwd=str(circuit_path.absolute()),
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            await run_command([Config.NARGO_PATH, "compile"], cwd=circuit_path.absolute())
             
             # Generate verification key
             vk_dir.mkdir(exist_ok=True)
             noir_json_path = target_dir / "noir.json"
-            subprocess.run([
+            await run_command([
                 Config.BB_PATH, "write_vk",
                 "-b", str(noir_json_path.absolute()),
                 "-o", str(vk_dir.absolute())
-            ], check=True, capture_output=False, text=True)
+            ])
             
             # Generate Solidity verifier
             vk_file_path = vk_dir / "vk"
-            subprocess.run([
+            await run_command([
                 Config.BB_PATH, "write_solidity_verifier",
                 "-k", str(vk_file_path.absolute()),
                 "-o", str(verifier_path.absolute())
-            ], check=True, capture_output=False, text=True)
+            ])
             
             # Compile Solidity contract
-            verifier_source = verifier_path.read_text()
+            bytecode = await self._compile_verifier(verifier_path)
+            self._store_artifacts(cache_path, target_dir)
+            
+            return {
+                "status": "success", 
+                "verifier_path": str(verifier_path), 
+                "bytecode": bytecode,
+                "circuit_id": circuit_id
+            }
             
-            with tempfile.TemporaryDirectory() as compile_dir:
-                temp_verifier_path = Path(compile_dir) / "Verifier.sol"
-                temp_verifier_path.write_text(verifier_source)
-                
-                subprocess.run([
-                    "solc",
-                    "--bin",
-                    "--optimize",
-                    "--optimize-runs", "200",
-                    str(temp_verifier_path),
-                    "-o", compile_dir
-                ], cwd=compile_dir, capture_output=True, text=True, check=True)
-                
-                bin_files = list(Path(compile_dir).glob("*.bin"))
-                if not bin_files:
-                    raise Exception("No compiled bytecode found")
-                
-                bytecode = bin_files[0].read_text().strip()
-                if bytecode.startswith('0x'):
-                    bytecode = bytecode[2:]
-                
-                return {
-                    "status": "success", 
-                    "verifier_path": str(verifier_path), 
-                    "bytecode": bytecode,
-                    "circuit_id": circuit_id
-                }
-                
         except subprocess.CalledProcessError as e:
             raise Exception(f"Compilation failed: {e.stderr}")
         except Exception as e:
             raise Exception(f"Contract compilation failed: {str(e)}")
 
+class TransientError(Exception):
+    """A failure worth retrying, such as an unreachable RPC endpoint."""
+
+def is_transient_rpc_error(error: Exception) -> bool:
+    """Whether an RPC failure may succeed on retry: connection, timeout or 5xx/429."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    # Reverts, invalid params and other JSON-RPC errors fail the same way every time
+    return False
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this PID is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class ProofJobQueue:
+    """Runs proof requests in the background with retries and persisted results."""
+    
+    def __init__(
+        self,
+        prove: Callable[[ProofRequest], Awaitable[bytes]],
+        build: Callable[[ProofRequest, bytes], Awaitable[Dict[str, Any]]]
+    ):
+        self.prove = prove
+        self.build = build
+        self.jobs_dir = Path(Config.PROOFS_DIR)
+        self.jobs_dir.mkdir(exist_ok=True)
+        self._queue: "asyncio.Queue[Tuple[str, ProofRequest, int]]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._active: Set[str] = set()
+    
+    def start(self) -> None:
+        """Start the worker tasks."""
+        self._fail_orphaned_jobs()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(Config.PROVE_WORKERS)]
+    
+    def _fail_orphaned_jobs(self) -> None:
+        """Fail unfinished jobs left behind by a process that no longer runs them."""
+        for record_path in self.jobs_dir.glob("*.json"):
+            try:
+                record = json.loads(record_path.read_text())
+            except (OSError, ValueError):
+                continue
+            if record.get("status") not in ("queued", "running", "retrying"):
+                continue
+            
+            # Jobs of sibling workers are still running; this process has none yet
+            pid = record.get("pid")
+            if pid is not None and pid != os.getpid() and _process_alive(pid):
+                continue
+            
+            logger.warning(f"Failing proof job {record['job_id']} left unfinished by a previous run")
+            self._update_record(record["job_id"], status="failed", error="Service restarted before the job completed")
+    
+    async def stop(self) -> None:
+        """Stop the workers and fail jobs that can no longer complete."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        for job_id in self._active:
+            self._update_record(job_id, status="failed", error="Service stopped before the job completed")
+        self._active.clear()
+    
+    def enqueue(self, request: ProofRequest) -> str:
+        """Queue a proof request and return its job ID."""
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        self._write_record(job_id, {
+            "job_id": job_id,
+            "circuit_id": request.circuit_id,
+            "pid": os.getpid(),
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+            "error": None,
+            "result": None
+        })
+        self._active.add(job_id)
+        self._queue.put_nowait((job_id, request, 1))
+        logger.info(f"Queued proof job {job_id} for circuit {request.circuit_id}")
+        return job_id
+    
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Get the status and result of a job."""
+        record_path = self._record_path(job_id)
+        if not job_id.isalnum() or not record_path.exists():
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return json.loads(record_path.read_text())
+    
+    def get_proof_path(self, job_id: str) -> Path:
+        """Get the proof file of a succeeded job."""
+        proof_path = self.jobs_dir / f"{job_id}.proof"
+        if self.get_job(job_id)["status"] != "succeeded" or not proof_path.exists():
+            raise HTTPException(status_code=404, detail=f"No proof available for job {job_id}")
+        return proof_path
+    
+    def _record_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+    
+    def _write_record(self, job_id: str, record: Dict[str, Any]) -> None:
+        record_path = self._record_path(job_id)
+        tmp_path = record_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(record, indent=2))
+        os.replace(tmp_path, record_path)
+    
+    def _update_record(self, job_id: str, **changes: Any) -> None:
+        record = json.loads(self._record_path(job_id).read_text())
+        record.update(changes, updated_at=datetime.now().isoformat())
+        self._write_record(job_id, record)
+    
+    async def _worker(self) -> None:
+        while True:
+            job_id, request, attempt = await self._queue.get()
+            try:
+                await self._run_job(job_id, request, attempt)
+            except Exception as e:
+                logger.error(f"Proof job {job_id} crashed: {str(e)}")
+            finally:
+                self._queue.task_done()
+    
+    async def _run_job(self, job_id: str, request: ProofRequest, attempt: int) -> None:
+        self._update_record(job_id, status="running", attempts=attempt)
+        proof_path = self.jobs_dir / f"{job_id}.proof"
+        
+        try:
+            # The proof is kept from an earlier attempt so retries only redo the transaction
+            if proof_path.exists():
+                proof_bytes = proof_path.read_bytes()
+            else:
+                proof_bytes = await asyncio.wait_for(self.prove(request), timeout=Config.PROOF_JOB_TIMEOUT)
+                proof_path.write_bytes(proof_bytes)
+            result = await self.build(request, proof_bytes)
+        except asyncio.TimeoutError:
+            self._fail(job_id, f"Job timed out after {Config.PROOF_JOB_TIMEOUT:.0f}s")
+            return
+        except TransientError as e:
+            error = str(e)
+        except Exception as e:
+            # Unknown circuits, bad inputs, failed witnesses and reverts fail the same way every time
+            self._fail(job_id, str(e))
+            return
+        else:
+            self._update_record(job_id, status="succeeded", error=None, result=result)
+            self._active.discard(job_id)
+            logger.info(f"Proof job {job_id} succeeded")
+            return
+        
+        if attempt >= Config.PROOF_JOB_MAX_ATTEMPTS:
+            self._fail(job_id, f"Failed after {attempt} attempts: {error}")
+            return
+        
+        # Exponential backoff without holding a worker while waiting
+        delay = Config.PROOF_JOB_BACKOFF * 2 ** (attempt - 1)
+        logger.warning(f"Proof job {job_id} attempt {attempt} failed, retrying in {delay:.0f}s: {error}")
+        self._update_record(job_id, status="retrying", error=error)
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, (job_id, request, attempt + 1))
+    
+    def _fail(self, job_id: str, error: str) -> None:
+        logger.error(f"Proof job {job_id} failed: {error}")
+        self._update_record(job_id, status="failed", error=error)
+        self._active.discard(job_id)
+
 # =============================================================================
 # SERVICE INSTANCES
 # =============================================================================
@@ -514,20 +1096,117 @@ proof_generator = ProofGenerator()
 contract_manager = ContractManager()
 blockchain_manager = BlockchainManager()
 
+# =============================================================================
+# WORKFLOWS
+# =============================================================================
+
+def build_call_data(proof_bytes: bytes, public_inputs: List[int]) -> bytearray:
+    """Concatenate the proof and the 32-byte big-endian public inputs."""
+    # One preallocated buffer instead of per-input objects plus join and concat copies
+    call_data = bytearray(len(proof_bytes) + 32 * len(public_inputs))
+    call_data[:len(proof_bytes)] = proof_bytes
+    offset = len(proof_bytes)
+    for input_val in public_inputs:
+        call_data[offset:offset + 32] = input_val.to_bytes(32, 'big')
+        offset += 32
+    return call_data
+
+def validate_proof_request(request: ProofRequest) -> None:
+    """Reject requests whose transaction could never be built."""
+    if request.network not in blockchain_manager.rpc_urls:
+        raise Exception(f"Unsupported network: {request.network}")
+    for address in (request.verifier_address, request.user_address):
+        if not Web3.is_address(address):
+            raise Exception(f"Invalid address: {address}")
+
+async def build_verification_transaction(request: ProofRequest, proof_bytes: bytes) -> Dict[str, Any]:
+    """Create the unsigned verification transaction for a generated proof."""
+    validate_proof_request(request)
+    
+    # Prepare call data
+    call_data = build_call_data(proof_bytes, request.public_inputs)
+    
+    # Create unsigned transaction
+    try:
+        transaction = await asyncio.to_thread(
+            blockchain_manager.build_unsigned_transaction,
+            request.verifier_address,
+            call_data,
+            request.user_address,
+            request.network
+        )
+    except Exception as e:
+        logger.error(f"Failed to create transaction: {str(e)}")
+        if is_transient_rpc_error(e):
+            raise TransientError(f"Failed to create transaction: {e}") from e
+        raise Exception(f"Failed to create transaction: {e}") from e
+    
+    # Update metadata
+    circuit_manager.record_proof(request.circuit_id)
+    
+    return {
+        "status": "success",
+        "circuit_id": request.circuit_id,
+        "proof_hash": hashlib.sha256(proof_bytes).hexdigest(),
+        "proof_size": len(proof_bytes),
+        "unsigned_transaction": transaction,
+        "network": request.network,
+        "verifier_address": request.verifier_address,
+        "public_inputs": request.public_inputs,
+        "message": "Proof generated and transaction created for offline signing"
+    }
+
+async def generate_request_proof(request: ProofRequest) -> bytes:
+    """Generate the proof for a proof request."""
+    return await proof_generator.generate_proof(request.circuit_id, request.inputs)
+
+async def prove_and_create_transaction(request: ProofRequest) -> Tuple[bytes, Dict[str, Any]]:
+    """Generate a proof and the unsigned verification transaction for it."""
+    proof_bytes = await generate_request_proof(request)
+    return proof_bytes, await build_verification_transaction(request, proof_bytes)
+
+proof_job_queue = ProofJobQueue(generate_request_proof, build_verification_transaction)
+
 # =============================================================================
 # FASTAPI APP
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers."""
+    proof_job_queue.start()
+    metadata_flusher = asyncio.create_task(circuit_manager.run_metadata_flusher())
+    network_probe = asyncio.create_task(blockchain_manager.run_network_probe())
+    yield
+    await proof_job_queue.stop()
+    for task in (metadata_flusher, network_probe):
+        task.cancel()
+    await asyncio.gather(metadata_flusher, network_probe, return_exceptions=True)
+    await circuit_manager.flush_metadata()
+
 app = FastAPI(
     title="Arcana ZK Protocol",
     description="Minimalist ZK proof generation service",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
 
+def etag_response(request: Request, body: bytes) -> Response:
+    """Return a JSON body with an ETag, or 304 if the client already has it."""
+    etag = f'"{hashlib.sha256(body).hexdigest()}"'
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 @app.get("/")
 async def health_check():
     """Health check endpoint."""
@@ -539,24 +1218,27 @@ async def health_check():
     }
 
 @app.get("/circuits", response_model=List[CircuitInfo])
-async def list_circuits():
+async def list_circuits(request: Request):
     """List all registered circuits."""
-    return circuit_manager.list_circuits()
+    circuits = await circuit_manager.list_circuits()
+    body = orjson.dumps([circuit.model_dump(mode="json") for circuit in circuits])
+    return etag_response(request, body)
 
 @app.get("/circuits/{circuit_id}", response_model=CircuitInfo)
-async def get_circuit_info(circuit_id: str):
+async def get_circuit_info(circuit_id: str, request: Request):
     """Get circuit information."""
-    return circuit_manager.get_circuit_info(circuit_id)
+    circuit = circuit_manager.get_circuit_info(circuit_id)
+    return etag_response(request, orjson.dumps(circuit.model_dump(mode="json")))
 
 @app.post("/register")
 async def register_circuit(request: CircuitRequest):
     """Register and compile a circuit."""
     try:
         # Register circuit
-        circuit_manager.register_circuit(request)
+        await circuit_manager.register_circuit(request)
         
         # Compile circuit
-        result = contract_manager.compile_circuit(request.circuit_id)
+        result = await contract_manager.compile_circuit(request.circuit_id)
         
         return {
             "status": "success",
@@ -580,37 +1262,11 @@ async def create_deployment_transaction(request: Dict[str, str]):
         network = request.get("network", "sapphire_mainnet")
         
         # Get bytecode from existing compilation
-        circuit_path = Path(Config.CIRCUITS_DIR) / circuit_id
-        target_dir = circuit_path / "target"
-        verifier_path = target_dir / "verifier.sol"
-        
-        if not verifier_path.exists():
-            raise Exception(f"Circuit {circuit_id} not compiled. Register it first.")
-        
-        # Read bytecode
-        with tempfile.TemporaryDirectory() as compile_dir:
-            temp_verifier_path = Path(compile_dir) / "Verifier.sol"
-            temp_verifier_path.write_text(verifier_path.read_text())
-            
-            subprocess.run([
-                "solc",
-                "--bin",
-                "--optimize",
-                "--optimize-runs", "200",
-                str(temp_verifier_path),
-                "-o", compile_dir
-            ], cwd=compile_dir, capture_output=True, text=True, check=True)
-            
-            bin_files = list(Path(compile_dir).glob("*.bin"))
-            if not bin_files:
-                raise Exception("No compiled bytecode found")
-            
-            bytecode = bin_files[0].read_text().strip()
-            if bytecode.startswith('0x'):
-                bytecode = bytecode[2:]
+        bytecode = await contract_manager.get_verifier_bytecode(circuit_id)
         
         # Create unsigned deployment transaction
-        tx_result = blockchain_manager.create_unsigned_deployment_transaction(
+        tx_result = await asyncio.to_thread(
+            blockchain_manager.create_unsigned_deployment_transaction,
             bytecode, network, user_address
         )
         
@@ -633,48 +1289,80 @@ async def create_deployment_transaction(request: Dict[str, str]):
 async def generate_proof_and_transaction(request: ProofRequest):
     """Generate proof and create unsigned transaction."""
     try:
-        # Generate proof
-        proof_b64 = proof_generator.generate_proof(request.circuit_id, request.inputs)
-        
-        # Prepare call data
-        proof_bytes = base64.b64decode(proof_b64)
-        public_inputs_bytes = b''.join(input_val.to_bytes(32, 'big') for input_val in request.public_inputs)
-        call_data = proof_bytes + public_inputs_bytes
+        _, result = await prove_and_create_transaction(request)
+        return result
         
-        # Create unsigned transaction
-        tx_result = blockchain_manager.create_unsigned_transaction(
-            request.verifier_address,
-            call_data,
-            request.user_address,
-            request.network
+    except Exception as e:
+        logger.error(f"Failed to generate proof: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/proof/jobs")
+async def enqueue_proof_job(request: ProofRequest):
+    """Queue proof generation and return a job ID to poll."""
+    try:
+        validate_proof_request(request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job_id = proof_job_queue.enqueue(request)
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "circuit_id": request.circuit_id,
+        "message": "Proof job queued, poll /proof/jobs/{job_id} for the result"
+    }
+
+@app.get("/proof/jobs/{job_id}")
+async def get_proof_job(job_id: str):
+    """Get proof job status and result."""
+    return proof_job_queue.get_job(job_id)
+
+@app.get("/proof/jobs/{job_id}/proof")
+async def download_proof(job_id: str):
+    """Stream the raw proof bytes of a finished job."""
+    return FileResponse(
+        proof_job_queue.get_proof_path(job_id),
+        media_type="application/octet-stream",
+        filename=f"{job_id}.proof"
+    )
+
+@app.post("/proof/batch")
+async def generate_proofs_batch(request: BatchProofRequest):
+    """Generate several proofs concurrently."""
+    if len(request.jobs) > Config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(request.jobs)} jobs (max {Config.MAX_BATCH_SIZE})"
+        )
+    
+    try:
+        proofs = await proof_generator.generate_proofs_batch(
+            [(job.circuit_id, job.inputs) for job in request.jobs]
         )
         
-        if tx_result["status"] != "success":
-            raise Exception(f"Failed to create transaction: {tx_result.get('error')}")
-        
-        # Update metadata
-        circuit_path = Path(Config.CIRCUITS_DIR) / request.circuit_id
-        metadata_path = circuit_path / "metadata.json"
-        if metadata_path.exists():
-            metadata = json.loads(metadata_path.read_text())
-            metadata["proof_count"] += 1
-            metadata["last_modified"] = datetime.now().isoformat()
-            metadata_path.write_text(json.dumps(metadata, indent=2))
+        results = []
+        for job, proof in zip(request.jobs, proofs):
+            if isinstance(proof, Exception):
+                results.append({"circuit_id": job.circuit_id, "status": "error", "error": str(proof)})
+                continue
+            
+            circuit_manager.record_proof(job.circuit_id)
+            results.append({
+                "circuit_id": job.circuit_id,
+                "status": "success",
+                "proof": base64.b64encode(proof).decode('utf-8'),
+                "proof_hash": hashlib.sha256(proof).hexdigest(),
+                "proof_size": len(proof)
+            })
         
         return {
             "status": "success",
-            "circuit_id": request.circuit_id,
-            "proof_hash": hashlib.sha256(proof_b64.encode()).hexdigest(),
-            "proof_size": len(proof_b64),
-            "unsigned_transaction": tx_result["unsigned_transaction"],
-            "network": request.network,
-            "verifier_address": request.verifier_address,
-            "public_inputs": request.public_inputs,
-            "message": "Proof generated and transaction created for offline signing"
+            "results": results,
+            "message": f"{sum(r['status'] == 'success' for r in results)}/{len(results)} proofs generated"
         }
         
     except Exception as e:
-        logger.error(f"Failed to generate proof: {str(e)}")
+        logger.error(f"Failed to generate proof batch: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/broadcast")
@@ -682,7 +1370,8 @@ async def broadcast_transaction(request: TransactionRequest):
     """Broadcast a signed transaction."""
     try:
         # Broadcast signed transaction
-        result = blockchain_manager.broadcast_signed_transaction(
+        result = await asyncio.to_thread(
+            blockchain_manager.broadcast_signed_transaction,
             request.signed_transaction,
             request.network
         )
@@ -692,15 +1381,13 @@ async def broadcast_transaction(request: TransactionRequest):
         
         # Handle deployment vs verification
         if request.transaction_type == "deployment":
-            # Update circuit metadata
-            circuit_path = Path(Config.CIRCUITS_DIR) / request.circuit_id
-            metadata_path = circuit_path / "metadata.json"
-            if metadata_path.exists():
-                metadata = json.loads(metadata_path.read_text())
-                metadata["status"] = "deployed"
-                metadata["verifier_address"] = result.get("contract_address")
-                metadata["last_modified"] = datetime.now().isoformat()
-                metadata_path.write_text(json.dumps(metadata, indent=2))
+            # Update circuit metadata off the loop; it waits on the cross-worker lock
+            await asyncio.to_thread(
+                circuit_manager.update_metadata,
+                request.circuit_id,
+                status="deployed",
+                verifier_address=result.get("contract_address")
+            )
             
             return {
                 "status": "success",
@@ -731,7 +1418,7 @@ async def broadcast_transaction(request: TransactionRequest):
 @app.get("/status")
 async def get_service_status():
     """Get service status."""
-    circuits = circuit_manager.list_circuits()
+    circuits = await circuit_manager.list_circuits()
     
     return {
         "status": "operational",
@@ -741,5 +1428,6 @@ async def get_service_status():
             "deployed_circuits": len([c for c in circuits if c.verifier_address])
         },
         "supported_networks": list(blockchain_manager.rpc_urls.keys()),
+        "network_status": blockchain_manager.network_status,
         "timestamp": datetime.now().isoformat()
     } 
\ No newline at end of file
@@ -4,58 +4,237 @@ Arcana ZK Protocol SDK
 Minimal SDK for interacting with the Arcana ZK Protocol API.
 """
 
+import os
+import re
+import json
+import hashlib
+import orjson
 import requests
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes."""
+    try:
+        return orjson.dumps(data)
+    except TypeError:
+        # orjson rejects integers wider than 64 bits, e.g. large public inputs
+        return json.dumps(data).encode()
+
+
+# A run of 19+ digits may be an integer outside orjson's 64-bit range
+_WIDE_INT = re.compile(rb"\d{19}")
+
+
+def _loads(body: bytes) -> Any:
+    """Parse a response body to JSON."""
+    if _WIDE_INT.search(body):
+        # orjson would turn such integers into floats; json keeps them exact
+        return json.loads(body)
+    return orjson.loads(body)
+
+
+def _default_cache_dir() -> Path:
+    """Directory for cached GET responses, following XDG_CACHE_HOME."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "arcana-zk"
+
+
+# Per-transport request callables: (transport, url, body) -> response
+_VERBS = {
+    "GET": lambda s, u, d: s.get(u),
+    "POST": lambda s, u, d: s.post(u, data=d),
+}
+_HTTPX_VERBS = {
+    "GET": lambda c, u, d: c.get(u),
+    "POST": lambda c, u, d: c.post(u, content=d),
+}
 
 
 class ArcanaZKClient:
     """Minimal SDK client for Arcana ZK Protocol."""
     
-    def __init__(self, base_url: str):
+    __slots__ = (
+        "base_url",
+        "session",
+        "_urls",
+        "_etags",
+        "_cache_dir",
+        "_client",
+        "_transport",
+        "_verbs",
+        "_errors",
+    )
+    
+    def __init__(self, base_url: str, http2: bool = False):
         """Initialize the Arcana ZK client."""
         if not base_url:
             raise ValueError("base_url is required")
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Absolute URLs for the fixed endpoints, built once per client
+        self._urls = {
+            name: self.base_url + path
+            for name, path in {
+                "health": "/",
+                "status": "/status",
+                "circuits": "/circuits",
+                "register": "/register",
+                "deploy": "/deploy",
+                "proof": "/proof",
+                "broadcast": "/broadcast",
+            }.items()
+        }
+        headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # ETag-validated GET bodies: url -> (etag, body), mirrored on disk
+        self._etags: Dict[str, Tuple[str, bytes]] = {}
+        self._cache_dir = _default_cache_dir()
+        # Keep connections alive across calls and retry transient errors on the same pool.
+        # POSTs such as /proof and /broadcast are not idempotent, so once one reaches
+        # the server it is never resent; they only retry failed connection attempts.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                other=0,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                respect_retry_after_header=True,
+                # Hand the last response back so raise_for_status reports the real status
+                raise_on_status=False
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Optional HTTP/2 transport; requests stays the default
+        self._client = None
+        self._transport = self.session
+        self._verbs = _VERBS
+        self._errors = (requests.exceptions.RequestException, json.JSONDecodeError)
+        if http2:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError("http2=True requires httpx: pip install 'arcana-zk-sdk[http2]'")
+            self._client = httpx.Client(
+                http2=True,
+                headers=headers,
+                limits=httpx.Limits(max_keepalive_connections=32),
+                # Match requests, which never times out: /register and /proof run for minutes
+                timeout=None
+            )
+            self._transport = self._client
+            self._verbs = _HTTPX_VERBS
+            self._errors += (httpx.HTTPError,)
+    
+    def close(self) -> None:
+        """Close the underlying HTTP connections."""
+        self.session.close()
+        if self._client is not None:
+            self._client.close()
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    def _make_request(self, method: str, url: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to the API."""
-        url = f"{self.base_url}{endpoint}"
+        verb = self._verbs.get(method.upper())
+        if verb is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            body = _dumps(data) if data is not None else None
+            response = verb(self._transport, url, body)
+            response.raise_for_status()
+            return _loads(response.content)
+            
+        except self._errors as e:
+            raise Exception(f"API request failed: {str(e)}")
+    
+    def _cached_entry(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """Look up a cached (etag, body) pair in memory, then on disk."""
+        entry = self._etags.get(url)
+        if entry is None:
+            try:
+                data = (self._cache_dir / hashlib.sha1(url.encode()).hexdigest()).read_bytes()
+            except OSError:
+                return None
+            etag, _, body = data.partition(b"\n")
+            entry = self._etags[url] = (etag.decode(), body)
+        return entry
+    
+    def _store_entry(self, url: str, etag: str, body: bytes) -> None:
+        """Remember a response body under its ETag."""
+        self._etags[url] = (etag, body)
+        path = self._cache_dir / hashlib.sha1(url.encode()).hexdigest()
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(etag.encode() + b"\n" + body)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk copy is only an optimisation
+            pass
+    
+    def _cached_get(self, url: str) -> Any:
+        """GET with If-None-Match, reusing the cached body on 304."""
+        entry = self._cached_entry(url)
+        headers = {"If-None-Match": entry[0]} if entry else None
+        
+        try:
+            response = self._transport.get(url, headers=headers)
+            if response.status_code == 304 and entry:
+                return _loads(entry[1])
             
             response.raise_for_status()
-            return response.json()
+            body = response.content
+            etag = response.headers.get("ETag")
+            if etag:
+                self._store_entry(url, etag, body)
+            return _loads(body)
+            
+        except self._errors as e:
+            raise Exception(f"API request failed: {str(e)}")
+    
+    def _post_streamed(self, url: str, data: Dict) -> Dict[str, Any]:
+        """POST and parse the response body straight off the socket."""
+        if self._client is not None:
+            return self._make_request("POST", url, data)
+        
+        try:
+            # Skips requests' chunked reassembly of response.content for large bodies
+            with self.session.post(url, data=_dumps(data), stream=True) as response:
+                response.raise_for_status()
+                return _loads(response.raw.read(decode_content=True))
             
-        except requests.exceptions.RequestException as e:
+        except self._errors + (Urllib3HTTPError,) as e:
             raise Exception(f"API request failed: {str(e)}")
     
     def health_check(self) -> Dict[str, Any]:
         """Check API health."""
-        return self._make_request("GET", "/")
+        return self._make_request("GET", self._urls["health"])
     
     def get_service_status(self) -> Dict[str, Any]:
         """Get service status."""
-        return self._make_request("GET", "/status")
+        return self._make_request("GET", self._urls["status"])
     
     def list_circuits(self) -> List[Dict[str, Any]]:
         """List all registered circuits."""
-        response = self._make_request("GET", "/circuits")
+        response = self._cached_get(self._urls["circuits"])
         return response if isinstance(response, list) else []
     
     def get_circuit_info(self, circuit_id: str) -> Dict[str, Any]:
         """Get information about a specific circuit."""
-        return self._make_request("GET", f"/circuits/{circuit_id}")
+        return self._cached_get(self._urls["circuits"] + "/" + circuit_id)
     
     def register_circuit(
         self,
@@ -66,14 +245,19 @@ class ArcanaZKClient:
         network: str = "sapphire_testnet"
     ) -> Dict[str, Any]:
         """Register a new circuit."""
+        # Omit unset optional fields; the API defaults them to null
         data = {
-            "circuit_id": circuit_id,
-            "nargo_toml": nargo_toml,
-            "main_nr": main_nr,
-            "description": description,
-            "network": network
+            key: value
+            for key, value in (
+                ("circuit_id", circuit_id),
+                ("nargo_toml", nargo_toml),
+                ("main_nr", main_nr),
+                ("description", description),
+                ("network", network),
+            )
+            if value is not None
         }
-        return self._make_request("POST", "/register", data)
+        return self._make_request("POST", self._urls["register"], data)
     
     def create_deployment_transaction(
         self,
@@ -87,7 +271,7 @@ class ArcanaZKClient:
             "user_address": user_address,
             "network": network
         }
-        return self._make_request("POST", "/deploy", data)
+        return self._make_request("POST", self._urls["deploy"], data)
     
     def generate_proof(
         self,
@@ -107,7 +291,8 @@ class ArcanaZKClient:
             "user_address": user_address,
             "network": network
         }
-        return self._make_request("POST", "/proof", data)
+        # Proof responses carry the proof and calldata, so read them in one pass
+        return self._post_streamed(self._urls["proof"], data)
     
     def broadcast_transaction(
         self,
@@ -119,17 +304,42 @@ class ArcanaZKClient:
         public_inputs: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """Broadcast a signed transaction."""
+        # Omit unset optional fields; the API defaults them to null
         data = {
-            "circuit_id": circuit_id,
-            "signed_transaction": signed_transaction,
-            "network": network,
-            "transaction_type": transaction_type,
-            "verifier_address": verifier_address,
-            "public_inputs": public_inputs
+            key: value
+            for key, value in (
+                ("circuit_id", circuit_id),
+                ("signed_transaction", signed_transaction),
+                ("network", network),
+                ("transaction_type", transaction_type),
+                ("verifier_address", verifier_address),
+                ("public_inputs", public_inputs),
+            )
+            if value is not None
         }
-        return self._make_request("POST", "/broadcast", data)
+        return self._make_request("POST", self._urls["broadcast"], data)
+    
+    def broadcast_many(self, txs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Broadcast independent signed transactions concurrently, results in input order."""
+        results: List[Dict[str, Any]] = [{}] * len(txs)
+        if not txs:
+            return results
+        
+        # Each entry holds broadcast_transaction keyword arguments
+        with ThreadPoolExecutor(max_workers=min(len(txs), 32)) as executor:
+            futures = {
+                executor.submit(self.broadcast_transaction, **tx): index
+                for index, tx in enumerate(txs)
+            }
+            for future in as_completed(futures):
+                # A failed broadcast must not hide the outcome of the others
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = {"status": "error", "error": str(e)}
+        return results
     
 
-def create_client(base_url: str) -> ArcanaZKClient:
+def create_client(base_url: str, http2: bool = False) -> ArcanaZKClient:
     """Create an Arcana ZK client instance."""
-    return ArcanaZKClient(base_url)
\ No newline at end of file
+    return ArcanaZKClient(base_url, http2=http2)
@@ -0,0 +1,162 @@
+"""
+Arcana ZK Protocol SDK - async client
+
+Asyncio counterpart of ArcanaZKClient for issuing independent API calls
+concurrently. Requires the optional ``aiohttp`` dependency.
+"""
+
+import aiohttp
+from typing import Dict, List, Optional, Any
+
+
+class AsyncArcanaZKClient:
+    """Async SDK client for Arcana ZK Protocol."""
+    
+    def __init__(self, base_url: str):
+        """Initialize the async Arcana ZK client."""
+        if not base_url:
+            raise ValueError("base_url is required")
+        self.base_url = base_url.rstrip('/')
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> "AsyncArcanaZKClient":
+        # The session must be created inside a running event loop
+        self._session = aiohttp.ClientSession(
+            headers={
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Any:
+        """Make HTTP request to the API."""
+        if self._session is None:
+            raise RuntimeError("Client session is not open; use 'async with AsyncArcanaZKClient(...)'")
+        
+        url = f"{self.base_url}{endpoint}"
+        
+        try:
+            if method.upper() == "GET":
+                request = self._session.get(url)
+            elif method.upper() == "POST":
+                request = self._session.post(url, json=data)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            async with request as response:
+                response.raise_for_status()
+                return await response.json()
+        
+        except aiohttp.ClientError as e:
+            raise Exception(f"API request failed: {str(e)}")
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Check API health."""
+        return await self._make_request("GET", "/")
+    
+    async def get_service_status(self) -> Dict[str, Any]:
+        """Get service status."""
+        return await self._make_request("GET", "/status")
+    
+    async def list_circuits(self) -> List[Dict[str, Any]]:
+        """List all registered circuits."""
+        response = await self._make_request("GET", "/circuits")
+        return response if isinstance(response, list) else []
+    
+    async def get_circuit_info(self, circuit_id: str) -> Dict[str, Any]:
+        """Get information about a specific circuit."""
+        return await self._make_request("GET", f"/circuits/{circuit_id}")
+    
+    async def register_circuit(
+        self,
+        circuit_id: str,
+        nargo_toml: str,
+        main_nr: str,
+        description: Optional[str] = None,
+        network: str = "sapphire_testnet"
+    ) -> Dict[str, Any]:
+        """Register a new circuit."""
+        # Omit unset optional fields; the API defaults them to null
+        data = {
+            key: value
+            for key, value in (
+                ("circuit_id", circuit_id),
+                ("nargo_toml", nargo_toml),
+                ("main_nr", main_nr),
+                ("description", description),
+                ("network", network),
+            )
+            if value is not None
+        }
+        return await self._make_request("POST", "/register", data)
+    
+    async def create_deployment_transaction(
+        self,
+        circuit_id: str,
+        user_address: str,
+        network: str = "sapphire_testnet"
+    ) -> Dict[str, Any]:
+        """Create unsigned deployment transaction."""
+        data = {
+            "circuit_id": circuit_id,
+            "user_address": user_address,
+            "network": network
+        }
+        return await self._make_request("POST", "/deploy", data)
+    
+    async def generate_proof(
+        self,
+        circuit_id: str,
+        inputs: Dict[str, Any],
+        public_inputs: List[int],
+        verifier_address: str,
+        user_address: str,
+        network: str = "sapphire_testnet"
+    ) -> Dict[str, Any]:
+        """Generate proof and create unsigned transaction."""
+        data = {
+            "circuit_id": circuit_id,
+            "inputs": inputs,
+            "public_inputs": public_inputs,
+            "verifier_address": verifier_address,
+            "user_address": user_address,
+            "network": network
+        }
+        return await self._make_request("POST", "/proof", data)
+    
+    async def broadcast_transaction(
+        self,
+        circuit_id: str,
+        signed_transaction: str,
+        network: str,
+        transaction_type: str,
+        verifier_address: Optional[str] = None,
+        public_inputs: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Broadcast a signed transaction."""
+        # Omit unset optional fields; the API defaults them to null
+        data = {
+            key: value
+            for key, value in (
+                ("circuit_id", circuit_id),
+                ("signed_transaction", signed_transaction),
+                ("network", network),
+                ("transaction_type", transaction_type),
+                ("verifier_address", verifier_address),
+                ("public_inputs", public_inputs),
+            )
+            if value is not None
+        }
+        return await self._make_request("POST", "/broadcast", data)
+
@@ -31,8 +31,15 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "requests>=2.25.0",
+        "orjson>=3.0.0",
     ],
     extras_require={
+        "async": [
+            "aiohttp>=3.9.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.27.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
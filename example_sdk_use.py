@@ -20,63 +20,114 @@ Assumptions
 import json
 import time
 import os
+import sys
+import logging
+import logging.handlers
+import functools
+import operator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from arcana_sdk import create_client
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from eth_account import Account
+except ImportError:
+    Account = None
+
 # Configuration - URL must be explicitly defined
 #API_URL = os.getenv("API_URL") # Real server
 API_URL = "http://localhost:8000"  # Local
 SAPPHIRE_KEY = os.getenv("SAPPHIRE_KEY")
 
+# Both deployment and verification broadcasts return these keys
+_extract_broadcast = operator.itemgetter("transaction_hash", "verifier_address")
+
+# Demo output is buffered in memory and written to stdout at the summary
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+_output_buffer = logging.handlers.MemoryHandler(
+    capacity=1024,
+    flushLevel=logging.CRITICAL,
+    target=_stdout_handler
+)
+logger = logging.getLogger("arcana_demo")
+logger.setLevel(logging.INFO)
+logger.addHandler(_output_buffer)
+logger.propagate = False
+
 if not SAPPHIRE_KEY:
-    print("⚠️  Warning: SAPPHIRE_KEY environment variable not set")
-    print("   Set it with: export SAPPHIRE_KEY=your_private_key_here")
-    print("   This demo will show the workflow but skip actual blockchain transactions")
-    print()
+    logger.info("⚠️  Warning: SAPPHIRE_KEY environment variable not set")
+    logger.info("   Set it with: export SAPPHIRE_KEY=your_private_key_here")
+    logger.info("   This demo will show the workflow but skip actual blockchain transactions")
+    logger.info("")
+
+@functools.lru_cache(maxsize=1)
+def _account():
+    """Derive the signing account from SAPPHIRE_KEY once."""
+    return Account.from_key(SAPPHIRE_KEY)
+
+@functools.lru_cache(maxsize=32)
+def _read_text(path_str: str, mtime_ns: int) -> str:
+    """Read a text file; the mtime key invalidates entries when it changes."""
+    return Path(path_str).read_text(encoding="utf-8")
 
 def print_test_header(test_name: str):
     """Print test header."""
-    print(f"\n{'='*60}")
-    print(f"TEST: {test_name}")
-    print(f"{'='*60}")
+    logger.info(f"\n{'='*60}")
+    logger.info(f"TEST: {test_name}")
+    logger.info(f"{'='*60}")
+
+def format_json(result) -> str:
+    """Pretty-print a response, preferring orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            # Integers wider than 64 bits are left to the json module
+            pass
+    return json.dumps(result, indent=2)
 
 def print_result(result: dict, success: bool = True):
     """Print test result."""
     status = "✅ PASS" if success else "❌ FAIL"
-    print(f"{status}: {json.dumps(result, indent=2)}")
+    logger.info("%s: %s", status, format_json(result))
 
-def test_health_check(client):
-    """Test health check endpoint."""
-    print_test_header("Health Check")
-    try:
-        result = client.health_check()
-        print_result(result, True)
-        return True
-    except Exception as e:
-        print_result({"error": str(e)}, False)
-        return False
+def fetch_connectivity(client):
+    """Fetch health, status and circuit list concurrently."""
+    checks = {
+        "Health Check": client.health_check,
+        "Service Status": client.get_service_status,
+        "List Circuits": client.list_circuits,
+    }
+    # The session's pooled adapter lets the threads share keep-alive connections
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {name: executor.submit(fn) for name, fn in checks.items()}
+    
+    outcomes = {}
+    for name, future in futures.items():
+        try:
+            outcomes[name] = future.result()
+        except Exception as e:
+            outcomes[name] = e
+    return outcomes
 
-def test_service_status(client):
-    """Test service status endpoint."""
-    print_test_header("Service Status")
-    try:
-        result = client.get_service_status()
-        print_result(result, True)
-        return True
-    except Exception as e:
-        print_result({"error": str(e)}, False)
+def report_check(test_name: str, outcome):
+    """Print a prefetched connectivity result."""
+    print_test_header(test_name)
+    if isinstance(outcome, Exception):
+        print_result({"error": str(outcome)}, False)
         return False
+    print_result(outcome, True)
+    return True
 
-def test_list_circuits(client):
-    """Test list circuits endpoint."""
-    print_test_header("List Circuits")
-    try:
-        result = client.list_circuits()
-        print_result(result, True)
-        return True
-    except Exception as e:
-        print_result({"error": str(e)}, False)
-        return False
+def sign_to_hex(unsigned_tx) -> str:
+    """Sign a transaction and hex-encode the raw bytes for broadcasting."""
+    return _account().sign_transaction(unsigned_tx).raw_transaction.hex()
 
 def test_register_circuit(client):
     """Test circuit registration with real circuit."""
@@ -87,7 +138,10 @@ def test_register_circuit(client):
     nargo_toml_path = circuit_path / "Nargo.toml"
     main_nr_path = circuit_path / "src" / "main.nr"
     
-    if not nargo_toml_path.exists() or not main_nr_path.exists():
+    try:
+        nargo_toml_mtime = os.stat(nargo_toml_path).st_mtime_ns
+        main_nr_mtime = os.stat(main_nr_path).st_mtime_ns
+    except FileNotFoundError:
         print_result({"error": "Circuit files not found"}, False)
         return None, False
     
@@ -95,12 +149,9 @@ def test_register_circuit(client):
     circuit_id = f"circuit_demo_{int(time.time())}"
     
     try:
-        # Read real circuit files
-        with open(nargo_toml_path, 'r') as f:
-            nargo_toml = f.read()
-        
-        with open(main_nr_path, 'r') as f:
-            main_nr = f.read()
+        # Read real circuit files (cached until they change on disk)
+        nargo_toml = _read_text(str(nargo_toml_path), nargo_toml_mtime)
+        main_nr = _read_text(str(main_nr_path), main_nr_mtime)
         
         result = client.register_circuit(
             circuit_id=circuit_id,
@@ -134,12 +185,15 @@ def test_create_deployment_transaction(client, circuit_id):
         print_result({"error": "SAPPHIRE_KEY not set, skipping deployment test"}, False)
         return None, False
     
+    if Account is None:
+        print_result({"error": "eth_account not installed"}, False)
+        return None, False
+    
     try:
-        from eth_account import Account
-        account = Account.from_key(SAPPHIRE_KEY)
+        account = _account()
         user_address = account.address
         
-        print(f"🔍 Using address: {user_address}")
+        logger.info(f"🔍 Using address: {user_address}")
         
         result = client.create_deployment_transaction(
             circuit_id=circuit_id,
@@ -160,21 +214,17 @@ def test_broadcast_deployment(client, circuit_id, deployment_result):
         print_result({"error": "SAPPHIRE_KEY not set, skipping broadcast"}, False)
         return None, False
     
+    if Account is None:
+        print_result({"error": "eth_account not installed"}, False)
+        return None, False
+    
     try:
-        from eth_account import Account
-        
-        account = Account.from_key(SAPPHIRE_KEY)
-        
-        # Sign the deployment transaction
-        unsigned_tx = deployment_result["unsigned_transaction"]
-        signed_tx = account.sign_transaction(unsigned_tx)
-        signed_tx_hex = signed_tx.raw_transaction.hex()
-        
-        print(f"🔍 Broadcasting deployment transaction...")
+        logger.info(f"🔍 Broadcasting deployment transaction...")
         
+        # Sign and broadcast the deployment transaction
         result = client.broadcast_transaction(
             circuit_id=circuit_id,
-            signed_transaction=signed_tx_hex,
+            signed_transaction=sign_to_hex(deployment_result["unsigned_transaction"]),
             network="sapphire_testnet",
             transaction_type="deployment"
         )
@@ -197,15 +247,18 @@ def test_generate_proof(client, circuit_id, verifier_address):
         print_result({"error": "SAPPHIRE_KEY not set, skipping proof generation"}, False)
         return None, False
     
+    if Account is None:
+        print_result({"error": "eth_account not installed"}, False)
+        return None, False
+    
     try:
-        from eth_account import Account
-        account = Account.from_key(SAPPHIRE_KEY)
+        account = _account()
         user_address = account.address
         
-        print(f"🔍 Generating proof with inputs: {inputs}")
-        print(f"🔍 Public inputs: {public_inputs}")
-        print(f"🔍 Verifier address: {verifier_address}")
-        print(f"🔍 User address: {user_address}")
+        logger.info(f"🔍 Generating proof with inputs: {inputs}")
+        logger.info(f"🔍 Public inputs: {public_inputs}")
+        logger.info(f"🔍 Verifier address: {verifier_address}")
+        logger.info(f"🔍 User address: {user_address}")
         
         result = client.generate_proof(
             circuit_id=circuit_id,
@@ -230,21 +283,17 @@ def test_broadcast_verification(client, circuit_id, proof_result):
         print_result({"error": "SAPPHIRE_KEY not set, skipping verification broadcast"}, False)
         return False, None
     
+    if Account is None:
+        print_result({"error": "eth_account not installed"}, False)
+        return False, None
+    
     try:
-        from eth_account import Account
-        
-        account = Account.from_key(SAPPHIRE_KEY)
-        
-        # Sign the verification transaction
-        unsigned_tx = proof_result["unsigned_transaction"]
-        signed_tx = account.sign_transaction(unsigned_tx)
-        signed_tx_hex = signed_tx.raw_transaction.hex()
-        
-        print(f"🔍 Broadcasting verification transaction...")
+        logger.info(f"🔍 Broadcasting verification transaction...")
         
+        # Sign and broadcast the verification transaction
         result = client.broadcast_transaction(
             circuit_id=circuit_id,
-            signed_transaction=signed_tx_hex,
+            signed_transaction=sign_to_hex(proof_result["unsigned_transaction"]),
             network="sapphire_testnet",
             transaction_type="verification",
             verifier_address=proof_result.get("verifier_address"),
@@ -259,9 +308,9 @@ def test_broadcast_verification(client, circuit_id, proof_result):
 
 def run_complete_workflow():
     """Run complete SDK workflow demonstration."""
-    print("🚀 Arcana ZK SDK - Minimal Workflow Demo")
-    print(f"Target URL: {API_URL}")
-    print(f"SAPPHIRE_KEY present: {bool(SAPPHIRE_KEY)}")
+    logger.info("🚀 Arcana ZK SDK - Minimal Workflow Demo")
+    logger.info(f"Target URL: {API_URL}")
+    logger.info(f"SAPPHIRE_KEY present: {bool(SAPPHIRE_KEY)}")
     
     # Create client with explicit URL
     client = create_client(API_URL)
@@ -279,13 +328,12 @@ def run_complete_workflow():
     }
     
     # Step 1: Basic connectivity tests
-    print("\n📋 Step 1: Service Connectivity")
-    results.append(("Health Check", test_health_check(client)))
-    results.append(("Service Status", test_service_status(client)))
-    results.append(("List Circuits", test_list_circuits(client)))
+    logger.info("\n📋 Step 1: Service Connectivity")
+    for test_name, outcome in fetch_connectivity(client).items():
+        results.append((test_name, report_check(test_name, outcome)))
     
     # Step 2: Register new circuit
-    print("\n📋 Step 2: Circuit Registration")
+    logger.info("\n📋 Step 2: Circuit Registration")
     circuit_id, success = test_register_circuit(client)
     results.append(("Register Circuit", success))
     
@@ -295,7 +343,7 @@ def run_complete_workflow():
         
         # Step 3: Deployment workflow (only if SAPPHIRE_KEY is set)
         if SAPPHIRE_KEY:
-            print("\n📋 Step 3: Contract Deployment")
+            logger.info("\n📋 Step 3: Contract Deployment")
             deployment_result, deployment_success = test_create_deployment_transaction(client, circuit_id)
             results.append(("Create Deployment Transaction", deployment_success))
             
@@ -306,25 +354,23 @@ def run_complete_workflow():
                 )
                 results.append(("Broadcast Deployment", deploy_broadcast_success))
                 
-                # Store deployment transaction hash
+                # Store deployment transaction hash and the deployed verifier address
+                verifier_address = None
                 if deploy_broadcast_result:
-                    workflow_data["deployment_tx_hash"] = deploy_broadcast_result.get("transaction_hash")
-                
-                # Get verifier address from deployment result
-                verifier_address = deploy_broadcast_result.get("verifier_address") if deploy_broadcast_result else None
+                    workflow_data["deployment_tx_hash"], verifier_address = _extract_broadcast(deploy_broadcast_result)
                 
                 if verifier_address:
                     workflow_data["verifier_address"] = verifier_address
-                    print(f"✅ Contract deployed at: {verifier_address}")
+                    logger.info(f"✅ Contract deployed at: {verifier_address}")
                     
                     # Step 4: Proof generation and verification
-                    print("\n📋 Step 4: Proof Generation & Verification")
+                    logger.info("\n📋 Step 4: Proof Generation & Verification")
                     proof_result, proof_success = test_generate_proof(client, circuit_id, verifier_address)
                     results.append(("Generate Proof", proof_success))
                     
                     if proof_success and proof_result:
                         # Store proof hash
-                        workflow_data["proof_hash"] = proof_result.get("proof_hash")
+                        workflow_data["proof_hash"] = proof_result["proof_hash"]
                         
                         # Broadcast verification
                         verification_success, verification_result = test_broadcast_verification(client, circuit_id, proof_result)
@@ -332,11 +378,11 @@ def run_complete_workflow():
                         
                         # Store verification transaction hash if available
                         if verification_success and verification_result:
-                            workflow_data["verification_tx_hash"] = verification_result.get("transaction_hash")
+                            workflow_data["verification_tx_hash"], _ = _extract_broadcast(verification_result)
                     else:
                         results.append(("Broadcast Verification", False))
                 else:
-                    print("⚠️  No verifier address available, skipping proof generation")
+                    logger.info("⚠️  No verifier address available, skipping proof generation")
                     results.append(("Generate Proof", False))
                     results.append(("Broadcast Verification", False))
             else:
@@ -344,45 +390,47 @@ def run_complete_workflow():
                 results.append(("Generate Proof", False))
                 results.append(("Broadcast Verification", False))
         else:
-            print("⚠️  SAPPHIRE_KEY not set, skipping blockchain operations")
+            logger.info("⚠️  SAPPHIRE_KEY not set, skipping blockchain operations")
             results.append(("Create Deployment Transaction", False))
             results.append(("Broadcast Deployment", False))
             results.append(("Generate Proof", False))
             results.append(("Broadcast Verification", False))
     
     # Summary
-    print(f"\n{'='*60}")
-    print("WORKFLOW SUMMARY")
-    print(f"{'='*60}")
+    logger.info(f"\n{'='*60}")
+    logger.info("WORKFLOW SUMMARY")
+    logger.info(f"{'='*60}")
     
     passed = 0
     total = len(results)
     
     for test_name, success in results:
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name}")
+        logger.info(f"{status}: {test_name}")
         if success:
             passed += 1
     
-    print(f"\nResults: {passed}/{total} steps completed successfully")
+    logger.info(f"\nResults: {passed}/{total} steps completed successfully")
     
     # Log final addresses and hashes
-    print(f"\n{'='*60}")
-    print("WORKFLOW DATA LOG")
-    print(f"{'='*60}")
-    print(f"Circuit ID: {workflow_data['circuit_id']}")
-    print(f"Verifier Address: {workflow_data['verifier_address']}")
-    print(f"Deployment TX Hash: {workflow_data['deployment_tx_hash']}")
-    print(f"Proof Hash: {workflow_data['proof_hash']}")
-    print(f"Verification TX Hash: {workflow_data['verification_tx_hash']}")
+    logger.info(f"\n{'='*60}")
+    logger.info("WORKFLOW DATA LOG")
+    logger.info(f"{'='*60}")
+    logger.info(f"Circuit ID: {workflow_data['circuit_id']}")
+    logger.info(f"Verifier Address: {workflow_data['verifier_address']}")
+    logger.info(f"Deployment TX Hash: {workflow_data['deployment_tx_hash']}")
+    logger.info(f"Proof Hash: {workflow_data['proof_hash']}")
+    logger.info(f"Verification TX Hash: {workflow_data['verification_tx_hash']}")
     
     if passed == total:
-        print("🎉 Complete workflow successful! SDK is working correctly.")
+        logger.info("🎉 Complete workflow successful! SDK is working correctly.")
     elif passed >= total - 4:  # Allow for missing SAPPHIRE_KEY
-        print("✅ Core functionality working! Blockchain operations skipped due to missing SAPPHIRE_KEY.")
-        print("💡 Set SAPPHIRE_KEY to test full deployment and verification workflow.")
+        logger.info("✅ Core functionality working! Blockchain operations skipped due to missing SAPPHIRE_KEY.")
+        logger.info("💡 Set SAPPHIRE_KEY to test full deployment and verification workflow.")
     else:
-        print("⚠️  Some steps failed. Check the logs above for details.")
+        logger.info("⚠️  Some steps failed. Check the logs above for details.")
+    
+    _output_buffer.flush()
 
 if __name__ == "__main__":
     run_complete_workflow() 
\ No newline at end of file
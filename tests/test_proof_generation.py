@@ -0,0 +1,98 @@
+"""
+Proof pipeline tests using stub nargo/bb binaries.
+"""
+
+import asyncio
+import importlib
+import stat
+import textwrap
+
+import pytest
+
+
+NARGO_STUB = """\
+#!/bin/sh
+# nargo execute: write the compiled program and witness into ./target
+mkdir -p target
+[ -f target/noir.json ] || echo '{}' > target/noir.json
+printf 'witness' > target/noir.gz
+"""
+
+BB_STUB = """\
+#!/bin/sh
+# bb prove -b <acir> -w <witness> -o <dir>, with paths relative to the cwd
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -b) acir="$2"; shift ;;
+        -w) witness="$2"; shift ;;
+        -o) out="$2"; shift ;;
+    esac
+    shift
+done
+# The service runs bb inside the scratch copy, so relative paths would resolve twice
+for path in "$acir" "$witness" "$out"; do
+    case "$path" in
+        /*) ;;
+        *) echo "No such file or directory: $path" >&2; exit 1 ;;
+    esac
+done
+[ -f "$acir" ] || { echo "No such file or directory: $acir" >&2; exit 1; }
+[ -f "$witness" ] || { echo "No such file or directory: $witness" >&2; exit 1; }
+printf 'proof-bytes' > "$out/proof"
+"""
+
+
+def write_stub(path, source):
+    path.write_text(textwrap.dedent(source))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Import the service with its relative data directories under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("app")
+    for directory in [module.Config.CIRCUITS_DIR, module.Config.PROOFS_DIR,
+                      module.Config.CACHE_DIR, module.Config.SCRATCH_DIR]:
+        (tmp_path / directory).mkdir(parents=True, exist_ok=True)
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setattr(module.Config, "NARGO_PATH", write_stub(bin_dir / "nargo", NARGO_STUB))
+    monkeypatch.setattr(module.Config, "BB_PATH", write_stub(bin_dir / "bb", BB_STUB))
+    return module
+
+
+def register_sources(app, circuit_id):
+    circuit_path = app.Path(app.Config.CIRCUITS_DIR) / circuit_id
+    (circuit_path / "src").mkdir(parents=True)
+    (circuit_path / "Nargo.toml").write_text('[package]\nname = "noir"\ntype = "bin"\n')
+    (circuit_path / "src" / "main.nr").write_text("fn main(x: Field, y: pub Field) { assert(x != y); }\n")
+    return circuit_path
+
+
+def test_generate_proof_in_scratch_dir(app):
+    register_sources(app, "demo")
+
+    proof = asyncio.run(app.ProofGenerator().generate_proof("demo", {"x": 1, "y": 2}))
+
+    assert proof == b"proof-bytes"
+    assert list(app.Path(app.Config.SCRATCH_DIR).iterdir()) == []
+
+
+def test_generate_proof_reuses_compiled_program(app):
+    circuit_path = register_sources(app, "demo")
+    (circuit_path / "target").mkdir()
+    (circuit_path / "target" / "noir.json").write_text('{"compiled": true}')
+
+    proof = asyncio.run(app.ProofGenerator().generate_proof("demo", {"x": 1, "y": 2}))
+
+    assert proof == b"proof-bytes"
+    # The registered program is seeded into the scratch copy, never modified in place
+    assert (circuit_path / "target" / "noir.json").read_text() == '{"compiled": true}'
+
+
+def test_generate_proof_unknown_circuit(app):
+    with pytest.raises(Exception, match="Circuit missing not found"):
+        asyncio.run(app.ProofGenerator().generate_proof("missing", {}))